@@ -1,19 +1,26 @@
 from .config import get_settings, Settings
-from .schemas import RunRequest, RunResponse
+from .schemas import RunRequest, RunResponse, BatchRunRequest, BatchRunResponse
 from .security import require_api_key
-from .job_store import job_store, Job, JobStatus
-from .llm_factory import get_llm, BaseLLM, AnthropicLLM, GeminiLLM
+from .job_store import job_store, get_job_store, Job, JobStatus, JobStore, RedisJobStore
+from .llm_factory import get_llm, get_crewai_llm, build_crewai_llm, BaseLLM, AnthropicLLM, GeminiLLM
 
 __all__ = [
     "get_settings",
     "Settings",
     "RunRequest",
     "RunResponse",
+    "BatchRunRequest",
+    "BatchRunResponse",
     "require_api_key",
     "job_store",
+    "get_job_store",
     "Job",
     "JobStatus",
+    "JobStore",
+    "RedisJobStore",
     "get_llm",
+    "get_crewai_llm",
+    "build_crewai_llm",
     "BaseLLM",
     "AnthropicLLM",
     "GeminiLLM",
@@ -59,6 +59,40 @@ class Settings(BaseSettings):
         description="Default Perplexity model to use"
     )
     
+    # Job Store Configuration
+    job_store_backend: Literal["memory", "redis"] = Field(
+        default="memory",
+        description="Backend for async job state; use redis to share jobs across workers"
+    )
+    redis_url: str = Field(
+        default="redis://localhost:6379/0",
+        description="Redis connection URL for the redis job store backend"
+    )
+    redis_timeout_seconds: float = Field(
+        default=5.0,
+        description="Socket and connect timeout for Redis calls in seconds"
+    )
+    max_parallel_jobs: int = Field(
+        default=8,
+        description="Maximum number of async crew jobs running at once"
+    )
+    
+    # Response Cache Configuration
+    response_cache_ttl_seconds: int = Field(
+        default=3600,
+        description="Time-to-live for cached crew responses in seconds"
+    )
+    cache_redis_url: str | None = Field(
+        default=None,
+        description="Redis connection URL for the shared response cache tier (optional)"
+    )
+    
+    # Debug Configuration
+    debug: bool = Field(
+        default=False,
+        description="Enable verbose CrewAI agent/crew output (development only)"
+    )
+    
     # Request Configuration
     request_timeout_seconds: int = Field(
         default=90,
@@ -1,13 +1,30 @@
 """
-In-memory job store with thread-safe operations and TTL cleanup.
+Job stores with thread-safe operations and TTL cleanup.
+
+The in-memory store spreads jobs across a fixed number of shards, each
+guarded by its own lock, so concurrent requests touching different jobs do
+not contend. The Redis store shares jobs across worker processes.
 """
+import secrets
 import threading
 import time
-import uuid
+from collections import Counter
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
 from typing import Any
 
+import orjson
+
+from app.core.config import get_settings
+
+# Time-to-live for jobs in seconds
+JOB_TTL_SECONDS = 3600
+
+# Number of shards; must be a power of two so a bit mask selects the shard
+_SHARD_COUNT = 8
+_SHARD_MASK = _SHARD_COUNT - 1
+
 
 class JobStatus(str, Enum):
     """Job execution status."""
@@ -17,7 +34,7 @@ class JobStatus(str, Enum):
     FAILED = "failed"
 
 
-@dataclass
+@dataclass(slots=True)
 class Job:
     """Represents an async job."""
     job_id: str
@@ -26,8 +43,25 @@ class Job:
     status: JobStatus = JobStatus.QUEUED
     result: dict[str, Any] | None = None
     error: dict[str, str] | None = None
-    created_at: float = field(default_factory=time.time)
-    updated_at: float = field(default_factory=time.time)
+    created_at: float = field(default_factory=time.monotonic)
+    updated_at: float = field(default_factory=time.monotonic)
+    
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Get the job's public fields as a dict.
+        
+        Built as a literal rather than via dataclasses.asdict, which reflects
+        over fields and deep-copies values. Monotonic timestamps are internal
+        and are left out.
+        """
+        return {
+            "job_id": self.job_id,
+            "status": self.status.value,
+            "crew": self.crew,
+            "trace_id": self.trace_id,
+            "result": self.result,
+            "error": self.error
+        }
 
 
 class JobStore:
@@ -42,10 +76,14 @@ class JobStore:
         Args:
             ttl_seconds: Time-to-live for jobs in seconds (default: 1 hour)
         """
-        self._jobs: dict[str, Job] = {}
-        self._lock = threading.RLock()
+        self._shards: list[dict[str, Job]] = [{} for _ in range(_SHARD_COUNT)]
+        self._locks = [threading.Lock() for _ in range(_SHARD_COUNT)]
         self._ttl_seconds = ttl_seconds
     
+    def _shard(self, job_id: str) -> int:
+        """Get the shard index for a job ID."""
+        return hash(job_id) & _SHARD_MASK
+    
     def create_job(self, trace_id: str, crew: str) -> Job:
         """
         Create a new job in QUEUED status.
@@ -57,11 +95,12 @@ class JobStore:
         Returns:
             Job: The created job
         """
-        job_id = str(uuid.uuid4())
+        job_id = secrets.token_hex(16)
         job = Job(job_id=job_id, trace_id=trace_id, crew=crew)
+        shard = self._shard(job_id)
         
-        with self._lock:
-            self._jobs[job_id] = job
+        with self._locks[shard]:
+            self._shards[shard][job_id] = job
         
         return job
     
@@ -75,8 +114,29 @@ class JobStore:
         Returns:
             Job or None if not found
         """
-        with self._lock:
-            return self._jobs.get(job_id)
+        shard = self._shard(job_id)
+        with self._locks[shard]:
+            return self._shards[shard].get(job_id)
+    
+    def get_job_snapshot(self, job_id: str) -> dict[str, Any] | None:
+        """
+        Get a point-in-time copy of a job's public fields.
+        
+        The dict is built under the shard lock, so it cannot observe a
+        half-applied update_job.
+        
+        Args:
+            job_id: The job ID
+            
+        Returns:
+            dict or None if not found
+        """
+        shard = self._shard(job_id)
+        with self._locks[shard]:
+            job = self._shards[shard].get(job_id)
+            if job is None:
+                return None
+            return job.to_dict()
     
     def update_job(
         self,
@@ -97,8 +157,9 @@ class JobStore:
         Returns:
             Updated Job or None if not found
         """
-        with self._lock:
-            job = self._jobs.get(job_id)
+        shard = self._shard(job_id)
+        with self._locks[shard]:
+            job = self._shards[shard].get(job_id)
             if job is None:
                 return None
             
@@ -109,41 +170,261 @@ class JobStore:
             if error is not None:
                 job.error = error
             
-            job.updated_at = time.time()
+            job.updated_at = time.monotonic()
             return job
     
     def cleanup_old_jobs(self) -> int:
         """
         Remove jobs older than TTL.
         
+        Shards are locked one at a time so requests on other shards are
+        not blocked during the sweep. Each shard dict keeps insertion order,
+        which is creation order, so expired jobs sit at the front and the
+        scan stops at the first job that is still live.
+        
         Returns:
             int: Number of jobs removed
         """
-        now = time.time()
+        now = time.monotonic()
         cutoff = now - self._ttl_seconds
+        removed = 0
+        
+        for lock, jobs in zip(self._locks, self._shards):
+            with lock:
+                old_job_ids = []
+                for job_id, job in jobs.items():
+                    if job.created_at >= cutoff:
+                        break
+                    old_job_ids.append(job_id)
+                
+                for job_id in old_job_ids:
+                    del jobs[job_id]
+            
+            removed += len(old_job_ids)
+        
+        return removed
+    
+    def get_stats(self) -> dict[str, int]:
+        """Get job store statistics."""
+        total = 0
+        status_counts: Counter[str] = Counter()
+        for lock, jobs in zip(self._locks, self._shards):
+            with lock:
+                total += len(jobs)
+                # Count plain status strings so the stats serialize as JSON
+                status_counts.update(job.status.value for job in jobs.values())
+        return {
+            "total": total,
+            **status_counts
+        }
+
+
+class RedisJobStore:
+    """
+    Redis-backed job store shared by all worker processes.
+    
+    Each job is stored as JSON under `job:{job_id}` with an expiry, so Redis
+    removes old jobs itself. Exposes the same methods as JobStore.
+    """
+    
+    def __init__(self, url: str, ttl_seconds: int = 3600, timeout: float = 5.0):
+        """
+        Initialize the job store.
+        
+        The client is synchronous; callers on the event loop should run
+        these methods in a worker thread.
+        
+        Args:
+            url: Redis connection URL
+            ttl_seconds: Time-to-live for jobs in seconds (default: 1 hour)
+            timeout: Socket and connect timeout in seconds (default: 5)
+        """
+        import redis
+        
+        self._redis = redis.Redis.from_url(
+            url,
+            socket_timeout=timeout,
+            socket_connect_timeout=timeout
+        )
+        self._ttl_seconds = ttl_seconds
+    
+    @staticmethod
+    def _key(job_id: str) -> str:
+        """Get the Redis key for a job ID."""
+        return f"job:{job_id}"
+    
+    @staticmethod
+    def _dumps(job: Job) -> bytes:
+        """
+        Serialize a job to JSON.
+        
+        Monotonic timestamps are not comparable across hosts, so they are
+        not stored; Redis tracks expiry itself.
+        """
+        return orjson.dumps({
+            "job_id": job.job_id,
+            "trace_id": job.trace_id,
+            "crew": job.crew,
+            "status": job.status.value,
+            "result": job.result,
+            "error": job.error
+        })
+    
+    @staticmethod
+    def _loads(data: bytes) -> Job:
+        """Deserialize a job from JSON."""
+        fields = orjson.loads(data)
+        return Job(
+            job_id=fields["job_id"],
+            trace_id=fields["trace_id"],
+            crew=fields["crew"],
+            status=JobStatus(fields["status"]),
+            result=fields["result"],
+            error=fields["error"]
+        )
+    
+    def create_job(self, trace_id: str, crew: str) -> Job:
+        """
+        Create a new job in QUEUED status.
+        
+        Args:
+            trace_id: Trace ID for the request
+            crew: Name of the crew to execute
+            
+        Returns:
+            Job: The created job
+        """
+        job = Job(job_id=secrets.token_hex(16), trace_id=trace_id, crew=crew)
+        # SET with EX stores the job and its expiry in one command
+        self._redis.set(self._key(job.job_id), self._dumps(job), ex=self._ttl_seconds)
+        return job
+    
+    def get_job(self, job_id: str) -> Job | None:
+        """
+        Get a job by ID.
+        
+        Args:
+            job_id: The job ID
+            
+        Returns:
+            Job or None if not found
+        """
+        data = self._redis.get(self._key(job_id))
+        if data is None:
+            return None
+        return self._loads(data)
+    
+    def get_job_snapshot(self, job_id: str) -> dict[str, Any] | None:
+        """
+        Get a point-in-time copy of a job's public fields.
         
-        with self._lock:
-            old_job_ids = [
-                job_id for job_id, job in self._jobs.items()
-                if job.created_at < cutoff
-            ]
+        Args:
+            job_id: The job ID
             
-            for job_id in old_job_ids:
-                del self._jobs[job_id]
+        Returns:
+            dict or None if not found
+        """
+        job = self.get_job(job_id)
+        if job is None:
+            return None
+        return job.to_dict()
+    
+    def update_job(
+        self,
+        job_id: str,
+        status: JobStatus | None = None,
+        result: dict[str, Any] | None = None,
+        error: dict[str, str] | None = None
+    ) -> Job | None:
+        """
+        Update a job's status and/or result.
+        
+        Only the worker running a job updates it, so a plain read-modify-write
+        is sufficient.
+        
+        Args:
+            job_id: The job ID
+            status: New status (optional)
+            result: Result data (optional)
+            error: Error data (optional)
             
-            return len(old_job_ids)
+        Returns:
+            Updated Job or None if not found
+        """
+        job = self.get_job(job_id)
+        if job is None:
+            return None
+        
+        if status is not None:
+            job.status = status
+        if result is not None:
+            job.result = result
+        if error is not None:
+            job.error = error
+        
+        job.updated_at = time.monotonic()
+        # XX skips jobs that expired meanwhile; KEEPTTL preserves the expiry
+        if not self._redis.set(self._key(job_id), self._dumps(job), xx=True, keepttl=True):
+            return None
+        return job
+    
+    def cleanup_old_jobs(self) -> int:
+        """
+        Remove jobs older than TTL.
+        
+        Redis expires job keys on its own, so there is nothing to sweep.
+        
+        Returns:
+            int: Number of jobs removed (always 0)
+        """
+        return 0
     
     def get_stats(self) -> dict[str, int]:
         """Get job store statistics."""
-        with self._lock:
-            status_counts = {}
-            for job in self._jobs.values():
-                status_counts[job.status.value] = status_counts.get(job.status.value, 0) + 1
-            return {
-                "total": len(self._jobs),
-                **status_counts
-            }
-
-
-# Global job store instance
-job_store = JobStore(ttl_seconds=3600)
+        total = 0
+        status_counts: Counter[str] = Counter()
+        keys: list[bytes] = []
+        
+        def count(batch: list[bytes]) -> None:
+            nonlocal total
+            # One MGET per batch rather than a GET per key; expired keys come back as None
+            for data in self._redis.mget(batch):
+                if data is None:
+                    continue
+                total += 1
+                status_counts[orjson.loads(data)["status"]] += 1
+        
+        for key in self._redis.scan_iter(match="job:*", count=500):
+            keys.append(key)
+            if len(keys) == 500:
+                count(keys)
+                keys = []
+        if keys:
+            count(keys)
+        
+        return {
+            "total": total,
+            **status_counts
+        }
+
+
+# Global in-memory job store instance
+job_store = JobStore(ttl_seconds=JOB_TTL_SECONDS)
+
+
+@lru_cache
+def get_job_store() -> JobStore | RedisJobStore:
+    """
+    Get the job store selected by settings.job_store_backend.
+    
+    Returns:
+        The shared in-memory store, or a Redis store when configured
+    """
+    settings = get_settings()
+    if settings.job_store_backend == "redis":
+        return RedisJobStore(
+            settings.redis_url,
+            ttl_seconds=JOB_TTL_SECONDS,
+            timeout=settings.redis_timeout_seconds
+        )
+    return job_store
@@ -2,17 +2,23 @@
 LLM Factory for creating LLM instances.
 
 Provides a unified interface for interacting with different LLM providers
-(Anthropic Claude and Google Gemini).
+(Anthropic Claude and Google Gemini), plus the CrewAI LLM factory shared by
+the crews.
 """
+import asyncio
+import sys
 from abc import ABC, abstractmethod
-from typing import Any
-
-import anthropic
-from google import genai
-from google.genai import types
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
 
 from app.core.config import Settings
 
+# Provider SDKs are imported on first use so that a process only pays for
+# the ones it actually talks to.
+if TYPE_CHECKING:
+    import httpx
+    from crewai import LLM
+
 
 class BaseLLM(ABC):
     """Abstract base class for LLM wrappers."""
@@ -29,6 +35,21 @@ class BaseLLM(ABC):
             str: The generated response text
         """
         pass
+    
+    async def agenerate(self, prompt: str) -> str:
+        """
+        Generate a response without blocking the event loop.
+        
+        The default runs generate() in a worker thread; wrappers whose SDK
+        has an async client override this.
+        
+        Args:
+            prompt: The input prompt
+            
+        Returns:
+            str: The generated response text
+        """
+        return await asyncio.to_thread(self.generate, prompt)
 
 
 class AnthropicLLM(BaseLLM):
@@ -43,10 +64,16 @@ class AnthropicLLM(BaseLLM):
             model: Model name (e.g., claude-3-5-sonnet-20240620)
             timeout: Request timeout in seconds
         """
+        import anthropic
+        
         self.client = anthropic.Anthropic(
             api_key=api_key,
             timeout=float(timeout)
         )
+        self.async_client = anthropic.AsyncAnthropic(
+            api_key=api_key,
+            timeout=float(timeout)
+        )
         self.model = model
         self.timeout = timeout
     
@@ -72,6 +99,29 @@ class AnthropicLLM(BaseLLM):
         if message.content and len(message.content) > 0:
             return message.content[0].text
         return ""
+    
+    async def agenerate(self, prompt: str) -> str:
+        """
+        Generate a response using Claude's async client.
+        
+        Args:
+            prompt: The input prompt
+            
+        Returns:
+            str: The generated response text
+        """
+        message = await self.async_client.messages.create(
+            model=self.model,
+            max_tokens=4096,
+            messages=[
+                {"role": "user", "content": prompt}
+            ]
+        )
+        
+        # Extract text from the response
+        if message.content and len(message.content) > 0:
+            return message.content[0].text
+        return ""
 
 
 class GeminiLLM(BaseLLM):
@@ -86,6 +136,8 @@ class GeminiLLM(BaseLLM):
             model: Model name (e.g., gemini-1.5-pro)
             timeout: Request timeout in seconds
         """
+        from google import genai
+        
         self.client = genai.Client(api_key=api_key)
         self.model = model
         self.timeout = timeout
@@ -100,6 +152,8 @@ class GeminiLLM(BaseLLM):
         Returns:
             str: The generated response text
         """
+        from google.genai import types
+        
         response = self.client.models.generate_content(
             model=self.model,
             contents=prompt,
@@ -112,6 +166,75 @@ class GeminiLLM(BaseLLM):
         if response.text:
             return response.text
         return ""
+    
+    async def agenerate(self, prompt: str) -> str:
+        """
+        Generate a response using Gemini's async client.
+        
+        Args:
+            prompt: The input prompt
+            
+        Returns:
+            str: The generated response text
+        """
+        from google.genai import types
+        
+        response = await self.client.aio.models.generate_content(
+            model=self.model,
+            contents=prompt,
+            config=types.GenerateContentConfig(
+                http_options=types.HttpOptions(timeout=self.timeout * 1000)
+            )
+        )
+        
+        # Extract text from the response
+        if response.text:
+            return response.text
+        return ""
+
+
+@lru_cache(maxsize=32)
+def _build_llm(llm_class: type[BaseLLM], api_key: str, model: str, timeout: int) -> BaseLLM:
+    """
+    Build and cache an LLM wrapper so its client and connection pool are reused.
+    
+    Rotating an API key requires calling `_build_llm.cache_clear()`.
+    
+    Args:
+        llm_class: Wrapper class to instantiate
+        api_key: Provider API key
+        model: Model name
+        timeout: Request timeout in seconds
+        
+    Returns:
+        BaseLLM: A cached LLM instance
+    """
+    return llm_class(api_key=api_key, model=model, timeout=timeout)
+
+
+def _build_anthropic(meta: dict[str, Any], settings: Settings, timeout: int) -> BaseLLM:
+    """Build the Anthropic wrapper for get_llm."""
+    if not settings.anthropic_api_key:
+        raise ValueError("ANTHROPIC_API_KEY is not configured")
+    
+    model = meta.get("model", settings.anthropic_model)
+    return _build_llm(AnthropicLLM, settings.anthropic_api_key, model, timeout)
+
+
+def _build_google(meta: dict[str, Any], settings: Settings, timeout: int) -> BaseLLM:
+    """Build the Gemini wrapper for get_llm."""
+    if not settings.google_api_key:
+        raise ValueError("GOOGLE_API_KEY is not configured")
+    
+    model = meta.get("model", settings.gemini_model)
+    return _build_llm(GeminiLLM, settings.google_api_key, model, timeout)
+
+
+# Provider name -> builder used by get_llm
+_PROVIDER_BUILDERS = {
+    "anthropic": _build_anthropic,
+    "google": _build_google,
+}
 
 
 def get_llm(meta: dict[str, Any] | None, settings: Settings) -> BaseLLM:
@@ -141,36 +264,183 @@ def get_llm(meta: dict[str, Any] | None, settings: Settings) -> BaseLLM:
     # Determine provider
     provider = meta.get("llm_provider", settings.default_llm_provider)
     
-    # Get timeout
-    timeout = settings.request_timeout_seconds
+    try:
+        builder = _PROVIDER_BUILDERS[provider]
+    except KeyError:
+        raise ValueError(f"Unknown LLM provider: {provider}") from None
     
-    if provider == "anthropic":
-        # Validate API key
-        if not settings.anthropic_api_key:
-            raise ValueError("ANTHROPIC_API_KEY is not configured")
-        
-        # Determine model
-        model = meta.get("model", settings.anthropic_model)
-        
-        return AnthropicLLM(
-            api_key=settings.anthropic_api_key,
-            model=model,
-            timeout=timeout
-        )
+    return builder(meta, settings, settings.request_timeout_seconds)
+
+
+# Pooled clients from install_litellm_http_pool, handed to litellm when the
+# first CrewAI LLM is built so startup does not import it
+_litellm_http_clients: tuple["httpx.Client", "httpx.AsyncClient"] | None = None
+
+
+def _apply_litellm_http_pool() -> None:
+    """Point litellm at the pooled HTTP clients, if a pool was installed."""
+    if _litellm_http_clients is None:
+        return
+    
+    import litellm
     
-    elif provider == "google":
-        # Validate API key
-        if not settings.google_api_key:
-            raise ValueError("GOOGLE_API_KEY is not configured")
+    litellm.client_session, litellm.aclient_session = _litellm_http_clients
+
+
+# LiteLLM marks the system message with cache_control so Anthropic caches
+# the agent's role/backstory/goal prefix across calls
+_ANTHROPIC_CACHE_POINTS = [{"location": "message", "role": "system"}]
+
+
+@lru_cache(maxsize=32)
+def build_crewai_llm(
+    model: str,
+    temperature: float,
+    timeout: int,
+    cache_system_prompt: bool = False
+) -> "LLM":
+    """
+    Build and cache a CrewAI LLM so repeated requests reuse the same client.
+    
+    CrewAI LLM objects hold only configuration once constructed, so a cached
+    instance is safe to share between concurrent crew runs.
+    
+    Args:
+        model: LiteLLM model string, including any provider prefix
+        temperature: Sampling temperature
+        timeout: Request timeout in seconds
+        cache_system_prompt: Request explicit prompt caching of the system
+            message (Anthropic; Gemini caches prefixes implicitly)
         
-        # Determine model
-        model = meta.get("model", settings.gemini_model)
+    Returns:
+        LLM: A cached CrewAI LLM instance
+    """
+    from crewai import LLM
+    
+    _apply_litellm_http_pool()
+    
+    extra: dict[str, Any] = {}
+    if cache_system_prompt:
+        extra["cache_control_injection_points"] = _ANTHROPIC_CACHE_POINTS
+    
+    return LLM(
+        model=model,
+        temperature=temperature,
+        timeout=timeout,
+        **extra
+    )
+
+
+def _build_crewai_anthropic(meta: dict[str, Any], settings: Settings, timeout: int) -> tuple["LLM", str, str]:
+    """Build the CrewAI LLM for Anthropic models."""
+    model = meta.get("model", settings.anthropic_model)
+    return build_crewai_llm(model, 0.7, timeout, cache_system_prompt=True), "anthropic", model
+
+
+def _build_crewai_google(meta: dict[str, Any], settings: Settings, timeout: int) -> tuple["LLM", str, str]:
+    """Build the CrewAI LLM for Gemini models."""
+    model = meta.get("model", settings.gemini_model)
+    # CrewAI uses "gemini/" prefix for Google models
+    llm = build_crewai_llm(
+        f"gemini/{model}" if not model.startswith("gemini/") else model,
+        0.7,
+        timeout
+    )
+    return llm, "google", model
+
+
+def _build_crewai_deepseek(meta: dict[str, Any], settings: Settings, timeout: int) -> tuple["LLM", str, str]:
+    """Build the CrewAI LLM for DeepSeek models."""
+    model = meta.get("model", settings.deepseek_model)
+    # CrewAI/LiteLLM uses "deepseek/" prefix for DeepSeek models
+    llm = build_crewai_llm(
+        f"deepseek/{model}" if not model.startswith("deepseek/") else model,
+        0.7,
+        timeout
+    )
+    return llm, "deepseek", model
+
+
+# Provider name -> builder used by get_crewai_llm
+_CREWAI_PROVIDER_BUILDERS = {
+    "anthropic": _build_crewai_anthropic,
+    "google": _build_crewai_google,
+    "deepseek": _build_crewai_deepseek,
+}
+
+
+def get_crewai_llm(meta: dict[str, Any] | None, settings: Settings) -> tuple["LLM", str, str]:
+    """
+    Create a CrewAI-compatible LLM from meta and settings.
+    
+    Returns:
+        tuple: (LLM instance, provider name, model name)
+    """
+    meta = meta or {}
+    
+    # Determine provider
+    provider = meta.get("llm_provider", settings.default_llm_provider)
+    
+    try:
+        builder = _CREWAI_PROVIDER_BUILDERS[provider]
+    except KeyError:
+        raise ValueError(f"Unknown LLM provider: {provider}") from None
+    
+    return builder(meta, settings, settings.request_timeout_seconds)
+
+
+def install_litellm_http_pool(settings: Settings) -> tuple["httpx.Client", "httpx.AsyncClient"]:
+    """
+    Install process-wide pooled HTTP clients for LiteLLM.
+    
+    CrewAI LLM calls go through LiteLLM, which otherwise may open a fresh
+    connection per call. Sharing keep-alive clients lets consecutive agent
+    turns reuse TCP/TLS connections. LiteLLM is slow to import, so the
+    clients are handed to it by build_crewai_llm rather than here. The
+    caller owns the returned clients and must close them on shutdown.
+    
+    Args:
+        settings: Application settings
         
-        return GeminiLLM(
-            api_key=settings.google_api_key,
-            model=model,
-            timeout=timeout
-        )
+    Returns:
+        tuple: (sync client, async client)
+    """
+    global _litellm_http_clients
+    
+    import httpx
+    
+    limits = httpx.Limits(
+        max_keepalive_connections=32,
+        max_connections=64,
+        keepalive_expiry=90
+    )
+    timeout = float(settings.request_timeout_seconds)
+    
+    client = httpx.Client(limits=limits, timeout=timeout)
+    async_client = httpx.AsyncClient(limits=limits, timeout=timeout)
+    
+    _litellm_http_clients = (client, async_client)
+    
+    # LLMs cached by an earlier lifespan won't be rebuilt, so hand over now
+    if "litellm" in sys.modules:
+        _apply_litellm_http_pool()
+    
+    return client, async_client
+
+
+def uninstall_litellm_http_pool() -> None:
+    """
+    Detach the pooled HTTP clients from litellm.
+    
+    Call before closing the clients on shutdown, so that later calls (from
+    jobs still running, or from cached LLMs in a later lifespan) do not use
+    closed clients.
+    """
+    global _litellm_http_clients
+    
+    _litellm_http_clients = None
     
-    else:
-        raise ValueError(f"Unknown LLM provider: {provider}")
+    litellm = sys.modules.get("litellm")
+    if litellm is not None:
+        litellm.client_session = None
+        litellm.aclient_session = None
@@ -4,6 +4,9 @@ Pydantic schemas for API requests and responses.
 from pydantic import BaseModel, Field
 from typing import Any
 
+# Upper bound on inputs per batch request
+MAX_BATCH_INPUTS = 32
+
 
 class RunRequest(BaseModel):
     """Request body for running a crew."""
@@ -18,3 +21,23 @@ class RunResponse(BaseModel):
     trace_id: str = Field(..., description="Unique trace ID for this request")
     result: dict[str, Any] | None = Field(default=None, description="Result data if successful")
     error: dict[str, str] | None = Field(default=None, description="Error details if failed")
+
+
+class BatchRunRequest(BaseModel):
+    """Request body for running a crew over several inputs."""
+    inputs: list[dict[str, Any]] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BATCH_INPUTS,
+        description="Input data for each crew run"
+    )
+    meta: dict[str, Any] | None = Field(default=None, description="Optional metadata shared by all runs")
+
+
+class BatchRunResponse(BaseModel):
+    """Response body from a batch crew run."""
+    ok: bool = Field(..., description="Whether the request succeeded")
+    crew: str = Field(..., description="Name of the crew that was executed")
+    trace_id: str = Field(..., description="Unique trace ID for this request")
+    results: list[dict[str, Any]] | None = Field(default=None, description="Per-input results, in input order, if successful")
+    error: dict[str, str] | None = Field(default=None, description="Error details if failed")
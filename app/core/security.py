@@ -1,10 +1,19 @@
 """
 Security utilities for API authentication.
 """
+import hmac
+from functools import lru_cache
+
 from fastapi import HTTPException, status
 from app.core.config import Settings
 
 
+@lru_cache(maxsize=4)
+def _api_key_bytes(api_key: str) -> bytes:
+    """Encode the configured API key once; it is fixed for the process lifetime."""
+    return api_key.encode()
+
+
 def require_api_key(header_value: str | None, settings: Settings) -> None:
     """
     Validate the API key from the request header.
@@ -22,7 +31,7 @@ def require_api_key(header_value: str | None, settings: Settings) -> None:
             detail="Missing X-API-Key header"
         )
     
-    if header_value != settings.api_key:
+    if not hmac.compare_digest(header_value.encode(), _api_key_bytes(settings.api_key)):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid API key"
@@ -1,6 +1,19 @@
-from .marketing_crew import MarketingCrew
-from .support_crew import SupportCrew
-from .analysis_crew import AnalysisCrew
-from .social_media_crew import SocialMediaCrew
+import importlib
+
+# Crew modules pull in crewai/litellm, so they are imported on first access
+_CREW_MODULES = {
+    "MarketingCrew": ".marketing_crew",
+    "SupportCrew": ".support_crew",
+    "AnalysisCrew": ".analysis_crew",
+    "SocialMediaCrew": ".social_media_crew",
+}
 
 __all__ = ["MarketingCrew", "SupportCrew", "AnalysisCrew", "SocialMediaCrew"]
+
+
+def __getattr__(name: str):
+    try:
+        module = _CREW_MODULES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    return getattr(importlib.import_module(module, __name__), name)
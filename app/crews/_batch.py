@@ -0,0 +1,48 @@
+"""
+Shared fan-out for crew batch runs.
+"""
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+async def run_batch_items(
+    items: list[T],
+    run_item: Callable[[T], Awaitable[dict[str, Any]]],
+    limit: int
+) -> list[dict[str, Any]]:
+    """
+    Run one coroutine per batch item with at most `limit` in flight.
+    
+    A failed item gets an error entry in its slot instead of failing the
+    whole batch, so results from runs that already completed are kept.
+    
+    Args:
+        items: Batch inputs
+        run_item: Coroutine function producing one item's result
+        limit: Maximum number of concurrent runs
+        
+    Returns:
+        list[dict]: Results or error entries, in input order
+    """
+    semaphore = asyncio.Semaphore(limit)
+    
+    async def run_one(item: T) -> dict[str, Any]:
+        async with semaphore:
+            try:
+                return await run_item(item)
+            except Exception as e:
+                logger.error(f"Batch item failed: {type(e).__name__}")
+                return {
+                    "error": {
+                        "code": "EXECUTION_ERROR",
+                        "message": "An error occurred during crew execution"
+                    }
+                }
+    
+    return list(await asyncio.gather(*(run_one(item) for item in items)))
@@ -0,0 +1,11 @@
+"""
+Shared retry policy for crew executions.
+"""
+from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+
+# Retry transient network failures once with exponential backoff
+crew_retry = retry(
+    stop=stop_after_attempt(2),
+    wait=wait_exponential(multiplier=1, min=2, max=10),
+    retry=retry_if_exception_type((TimeoutError, ConnectionError))
+)
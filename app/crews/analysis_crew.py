@@ -1,57 +1,40 @@
 """
 Analysis Crew - CrewAI implementation for data analysis workflows.
 """
-from typing import Any
+import asyncio
+import threading
+from functools import lru_cache
 
 from crewai import Agent, Task, Crew, LLM
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
 from app.core.config import get_settings, Settings
+from app.core.llm_factory import get_crewai_llm
+from app.crews._batch import run_batch_items
+from app.crews._retry import crew_retry
+from app.utils.response_cache import get_response_cache, payload_cache_key, cache_enabled
 
 
-def _get_crewai_llm(meta: dict[str, Any] | None, settings: Settings) -> tuple[LLM, str, str]:
+# Task prompt template; bound format method so callers just pass the fields
+_ANALYSIS_PROMPT = (
+    "Analyze the following data: '{data}'. Goal: {goal}. Provide a concise analysis with key findings."
+).format
+
+
+@lru_cache(maxsize=64)
+def _get_analyst(llm: LLM, thread_id: int) -> Agent:
     """
-    Create a CrewAI-compatible LLM from meta and settings.
+    Build and cache the data analyst agent for an LLM.
     
-    Returns:
-        tuple: (LLM instance, provider name, model name)
+    Agents carry per-execution state, so each worker thread gets its own
+    instance rather than sharing one across concurrent runs.
     """
-    meta = meta or {}
-    
-    # Determine provider
-    provider = meta.get("llm_provider", settings.default_llm_provider)
-    
-    if provider == "anthropic":
-        model = meta.get("model", settings.anthropic_model)
-        llm = LLM(
-            model=model,
-            temperature=0.7,
-            timeout=settings.request_timeout_seconds
-        )
-        return llm, "anthropic", model
-    
-    elif provider == "google":
-        model = meta.get("model", settings.gemini_model)
-        # CrewAI uses "gemini/" prefix for Google models
-        llm = LLM(
-            model=f"gemini/{model}" if not model.startswith("gemini/") else model,
-            temperature=0.7,
-            timeout=settings.request_timeout_seconds
-        )
-        return llm, "google", model
-    
-    elif provider == "deepseek":
-        model = meta.get("model", settings.deepseek_model)
-        # CrewAI/LiteLLM uses "deepseek/" prefix for DeepSeek models
-        llm = LLM(
-            model=f"deepseek/{model}" if not model.startswith("deepseek/") else model,
-            temperature=0.7,
-            timeout=settings.request_timeout_seconds
-        )
-        return llm, "deepseek", model
-    
-    else:
-        raise ValueError(f"Unknown LLM provider: {provider}")
+    return Agent(
+        role="Data Analyst",
+        goal="Analyze data and deliver the insights each task asks for",
+        backstory="You are an expert data analyst with strong skills in pattern recognition and deriving actionable insights from complex data.",
+        llm=llm,
+        verbose=False
+    )
 
 
 class AnalysisCrew:
@@ -60,18 +43,17 @@ class AnalysisCrew:
     Uses CrewAI with one agent and one task.
     """
     
-    def __init__(self):
-        self.settings = get_settings()
+    def __init__(self, settings: Settings | None = None):
+        self.settings = settings or get_settings()
     
-    @retry(
-        stop=stop_after_attempt(2),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type((TimeoutError, ConnectionError))
-    )
+    @crew_retry
     def _execute_crew(self, crew: Crew) -> str:
         """Execute the crew with retry logic."""
         result = crew.kickoff()
-        return result.raw if hasattr(result, 'raw') else str(result)
+        try:
+            return result.raw
+        except AttributeError:
+            return str(result)
     
     def run(self, payload: dict, meta: dict | None, trace_id: str) -> dict:
         """
@@ -93,20 +75,22 @@ class AnalysisCrew:
         analysis_goal = payload.get("analysis_goal", "identify key insights")
         
         # Get LLM
-        llm, provider, model = _get_crewai_llm(meta, self.settings)
+        llm, provider, model = get_crewai_llm(meta, self.settings)
         
-        # Create agent
-        analyst = Agent(
-            role="Data Analyst",
-            goal=f"Analyze data and {analysis_goal}",
-            backstory="You are an expert data analyst with strong skills in pattern recognition and deriving actionable insights from complex data.",
-            llm=llm,
-            verbose=False
-        )
+        # Serve repeated requests from the response cache
+        use_cache = cache_enabled(meta)
+        if use_cache:
+            cache_key = payload_cache_key("analysis", payload, meta, provider, model)
+            cached = get_response_cache().get(cache_key)
+            if cached is not None:
+                return {**cached, "trace_id": trace_id}
+        
+        # Reuse this thread's agent for the LLM
+        analyst = _get_analyst(llm, threading.get_ident())
         
         # Create task
         task = Task(
-            description=f"Analyze the following data: '{data_description}'. Goal: {analysis_goal}. Provide a concise analysis with key findings.",
+            description=_ANALYSIS_PROMPT(data=data_description, goal=analysis_goal),
             expected_output="A brief analysis with 2-3 key insights",
             agent=analyst
         )
@@ -120,7 +104,7 @@ class AnalysisCrew:
         
         output = self._execute_crew(crew)
         
-        return {
+        result = {
             "workflow": "analysis",
             "trace_id": trace_id,
             "provider": provider,
@@ -131,6 +115,34 @@ class AnalysisCrew:
                 "analysis_goal": analysis_goal
             }
         }
+        
+        if use_cache:
+            get_response_cache().put(cache_key, result)
+        
+        return result
+    
+    async def run_batch(self, payloads: list[dict], meta: dict | None, trace_id: str) -> list[dict]:
+        """
+        Run the analysis crew for several inputs concurrently.
+        
+        Each run executes in a worker thread so the LLM round-trips overlap
+        instead of adding up. At most settings.max_parallel_jobs runs are in
+        flight, and a failed input gets an error entry instead of failing
+        the batch.
+        
+        Args:
+            payloads: Input data for each run, as accepted by run()
+            meta: Optional metadata with llm_provider and model overrides
+            trace_id: Unique trace ID for the request
+            
+        Returns:
+            list[dict]: Results in the same order as payloads
+        """
+        return await run_batch_items(
+            payloads,
+            lambda payload: asyncio.to_thread(self.run, payload, meta, trace_id),
+            self.settings.max_parallel_jobs
+        )
     
     def kickoff(self) -> str:
         """Legacy method for compatibility."""
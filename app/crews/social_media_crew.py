@@ -4,57 +4,150 @@ Social Media Content Automation Hub Crew
 Uses Perplexity for research tasks and Gemini for content creation.
 """
 import logging
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
 from typing import Any
 from crewai import Agent, Crew, Process, Task, LLM
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from crewai.tasks.task_output import TaskOutput
 
 from app.core.config import get_settings, Settings
+from app.core.llm_factory import build_crewai_llm
+from app.crews._retry import crew_retry
+from app.utils.response_cache import get_response_cache, payload_cache_key, cache_enabled
 
 logger = logging.getLogger(__name__)
 
 
 def _get_gemini_llm(settings: Settings) -> LLM:
-    """Create Gemini LLM for content tasks."""
-    return LLM(
-        model=f"gemini/{settings.gemini_model}",
-        temperature=0.7,
-        timeout=settings.request_timeout_seconds
+    """Get the cached Gemini LLM for content tasks."""
+    return build_crewai_llm(
+        f"gemini/{settings.gemini_model}",
+        0.7,
+        settings.request_timeout_seconds
     )
 
 
 def _get_perplexity_llm(settings: Settings) -> LLM:
-    """Create Perplexity LLM for research tasks."""
-    return LLM(
-        model=f"perplexity/{settings.perplexity_model}",
-        temperature=0.5,
-        timeout=settings.request_timeout_seconds
+    """Get the cached Perplexity LLM for research tasks."""
+    return build_crewai_llm(
+        f"perplexity/{settings.perplexity_model}",
+        0.5,
+        settings.request_timeout_seconds
     )
 
 
+# Prompt text. Agent role/backstory/goal form the system prompt and are kept
+# free of per-run values so providers can cache that prefix; run-specific
+# details go in the task templates, filled with str.format_map.
+_RESEARCH_GOAL = "Research and identify trending topics, hashtags, and content opportunities in the requested industry"
+_RESEARCH_BACKSTORY = """You are an expert social media researcher with deep knowledge of digital
+marketing trends and viral content patterns. You understand the nuances of different
+social media platforms and how trends translate across them."""
+
+_CONTENT_GOAL = "Generate compelling, platform-specific social media content ideas for the requested company"
+_CONTENT_BACKSTORY = """You are a creative social media strategist with expertise in content
+creation across all major platforms. You excel at adapting trending topics into
+brand-appropriate content that drives engagement."""
+
+_ANALYTICS_GOAL = "Analyze social media performance and provide data-driven recommendations for the requested company"
+_ANALYTICS_BACKSTORY = """You are a social media analytics expert with extensive experience in
+interpreting engagement metrics. You excel at finding patterns in posting times,
+content performance, and audience behavior."""
+
+_SCHEDULER_GOAL = "Create comprehensive posting schedules optimizing timing and frequency for the requested company"
+_SCHEDULER_BACKSTORY = """You are an experienced social media manager who specializes in content
+scheduling and campaign coordination. You understand optimal posting frequencies
+for different platforms and time zone considerations."""
+
+_RESEARCH_TASK = """Research current trending topics, hashtags, and conversation themes
+relevant to the {industry} industry. Identify emerging trends, viral content patterns,
+and topics that are gaining traction. Focus on finding opportunities that {company_name}
+can leverage for engaging content."""
+_RESEARCH_OUTPUT = """A comprehensive trend report including:
+1) Top 10 trending topics in {industry}
+2) Relevant hashtags and their performance
+3) Emerging conversation themes
+4) Content opportunities for {company_name}
+5) Platform-specific trending patterns"""
+
+_ANALYTICS_TASK = """Analyze current social media performance patterns and industry best
+practices to identify optimal posting times, content types, and engagement strategies
+for {company_name}. Provide data-driven recommendations."""
+_ANALYTICS_OUTPUT = """A performance optimization report including:
+1) Optimal posting times for each platform
+2) Best performing content types and formats
+3) Audience engagement patterns
+4) Posting frequency recommendations
+5) Key metrics to track"""
+
+_CONTENT_TASK = """Based on the trending topics research, create a comprehensive content
+strategy with specific post ideas, captions, and content formats optimized for
+different social media platforms. Ensure all content aligns with {company_name}'s
+brand voice while leveraging current trends.
+
+Trending topics research:
+{research}"""
+_CONTENT_OUTPUT = """A detailed content strategy including:
+1) 20+ specific post ideas with platform adaptations
+2) Sample captions for each platform
+3) Content themes and pillars
+4) Visual content suggestions
+5) Hashtag recommendations
+6) Call-to-action strategies"""
+
+_SCHEDULE_TASK = """Combine the content strategy and optimal timing recommendations to
+create a comprehensive 30-day social media publishing schedule for {company_name}.
+Include specific posting times, platform assignments, and content details.
+
+Optimal timing recommendations:
+{analytics}"""
+_SCHEDULE_OUTPUT = """A complete 30-day social media calendar including:
+1) Daily posting schedule with specific times
+2) Content assignments with captions
+3) Visual content requirements
+4) Cross-platform adaptation notes
+5) Engagement monitoring checkpoints
+6) Content preparation timeline"""
+
+
 class SocialMediaCrew:
     """Social Media Content Automation Hub crew with 4 specialized agents."""
     
-    def __init__(self):
-        self.settings = get_settings()
+    # Runs four tasks in two phases, so ?stream=true has progress to report
+    streams_task_output = True
     
-    @retry(
-        stop=stop_after_attempt(2),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type((TimeoutError, ConnectionError))
-    )
+    def __init__(self, settings: Settings | None = None):
+        self.settings = settings or get_settings()
+        
+        # Verbose step output is for development; surface crewai's own logs too
+        if self.settings.debug:
+            logging.getLogger("crewai").setLevel(logging.INFO)
+    
+    @crew_retry
     def _execute_crew(self, crew: Crew) -> str:
         """Execute the crew with retry logic."""
         result = crew.kickoff()
-        return result.raw if hasattr(result, 'raw') else str(result)
+        try:
+            return result.raw
+        except AttributeError:
+            return str(result)
     
-    def run(self, payload: dict, meta: dict | None, trace_id: str) -> dict:
+    def run(
+        self,
+        payload: dict,
+        meta: dict | None,
+        trace_id: str,
+        on_task_output: Callable[[TaskOutput], None] | None = None
+    ) -> dict:
         """
         Run the Social Media crew workflow.
         
         Args:
             payload: Must contain 'industry' and 'company_name'
-            meta: Optional metadata (not used for this crew)
+            meta: Optional metadata (only no_cache is used by this crew)
             trace_id: Trace ID for logging
+            on_task_output: Optional callback invoked with each task's output as it completes
             
         Returns:
             dict with execution result
@@ -68,131 +161,135 @@ class SocialMediaCrew:
         industry = payload["industry"]
         company_name = payload["company_name"]
         
+        # Serve repeated requests from the response cache
+        use_cache = cache_enabled(meta)
+        if use_cache:
+            cache_key = payload_cache_key(
+                "social_media",
+                payload,
+                meta,
+                self.settings.gemini_model,
+                self.settings.perplexity_model
+            )
+            cached = get_response_cache().get(cache_key)
+            if cached is not None:
+                return cached
+        
         # Get LLMs
         gemini_llm = _get_gemini_llm(self.settings)
         research_llm = _get_perplexity_llm(self.settings)
         
+        fields = {"industry": industry, "company_name": company_name}
+        verbose = self.settings.debug
+        
         # Create agents
         research_agent = Agent(
             role="Social Media Trend Research Specialist",
-            goal=f"Research and identify trending topics, hashtags, and content opportunities in {industry}",
-            backstory="""You are an expert social media researcher with deep knowledge of digital 
-            marketing trends and viral content patterns. You understand the nuances of different 
-            social media platforms and how trends translate across them.""",
+            goal=_RESEARCH_GOAL,
+            backstory=_RESEARCH_BACKSTORY,
             llm=research_llm,
             allow_delegation=False,
-            verbose=True
+            verbose=verbose
         )
         
         content_agent = Agent(
             role="Content Strategy and Creation Specialist",
-            goal=f"Generate compelling, platform-specific social media content ideas for {company_name}",
-            backstory="""You are a creative social media strategist with expertise in content 
-            creation across all major platforms. You excel at adapting trending topics into 
-            brand-appropriate content that drives engagement.""",
+            goal=_CONTENT_GOAL,
+            backstory=_CONTENT_BACKSTORY,
             llm=gemini_llm,
             allow_delegation=False,
-            verbose=True
+            verbose=verbose
         )
         
         analytics_agent = Agent(
             role="Engagement Analytics and Optimization Specialist",
-            goal=f"Analyze social media performance and provide data-driven recommendations for {company_name}",
-            backstory="""You are a social media analytics expert with extensive experience in 
-            interpreting engagement metrics. You excel at finding patterns in posting times, 
-            content performance, and audience behavior.""",
+            goal=_ANALYTICS_GOAL,
+            backstory=_ANALYTICS_BACKSTORY,
             llm=gemini_llm,
             allow_delegation=False,
-            verbose=True
+            verbose=verbose
         )
         
         scheduler_agent = Agent(
             role="Social Media Schedule Coordinator",
-            goal=f"Create comprehensive posting schedules optimizing timing and frequency for {company_name}",
-            backstory="""You are an experienced social media manager who specializes in content 
-            scheduling and campaign coordination. You understand optimal posting frequencies 
-            for different platforms and time zone considerations.""",
+            goal=_SCHEDULER_GOAL,
+            backstory=_SCHEDULER_BACKSTORY,
             llm=gemini_llm,
             allow_delegation=False,
-            verbose=True
+            verbose=verbose
         )
         
         # Define tasks
         research_task = Task(
-            description=f"""Research current trending topics, hashtags, and conversation themes 
-            relevant to the {industry} industry. Identify emerging trends, viral content patterns, 
-            and topics that are gaining traction. Focus on finding opportunities that {company_name} 
-            can leverage for engaging content.""",
-            expected_output=f"""A comprehensive trend report including:
-            1) Top 10 trending topics in {industry}
-            2) Relevant hashtags and their performance
-            3) Emerging conversation themes
-            4) Content opportunities for {company_name}
-            5) Platform-specific trending patterns""",
-            agent=research_agent
+            description=_RESEARCH_TASK.format_map(fields),
+            expected_output=_RESEARCH_OUTPUT.format_map(fields),
+            agent=research_agent,
+            callback=on_task_output
         )
         
         analytics_task = Task(
-            description=f"""Analyze current social media performance patterns and industry best 
-            practices to identify optimal posting times, content types, and engagement strategies 
-            for {company_name}. Provide data-driven recommendations.""",
-            expected_output="""A performance optimization report including:
-            1) Optimal posting times for each platform
-            2) Best performing content types and formats
-            3) Audience engagement patterns
-            4) Posting frequency recommendations
-            5) Key metrics to track""",
-            agent=analytics_agent
+            description=_ANALYTICS_TASK.format_map(fields),
+            expected_output=_ANALYTICS_OUTPUT,
+            agent=analytics_agent,
+            callback=on_task_output
         )
         
+        logger.info(f"Starting Social Media crew for {company_name} in {industry}")
+        
+        # Phase 1: research and analytics are independent, so run them concurrently
+        research_crew = Crew(
+            agents=[research_agent],
+            tasks=[research_task],
+            verbose=verbose
+        )
+        analytics_crew = Crew(
+            agents=[analytics_agent],
+            tasks=[analytics_task],
+            verbose=verbose
+        )
+        
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="social-media") as executor:
+            # Run each sub-crew in a copy of this context so logs keep the trace ID
+            research_future = executor.submit(copy_context().run, self._execute_crew, research_crew)
+            analytics_future = executor.submit(copy_context().run, self._execute_crew, analytics_crew)
+            research_output = research_future.result()
+            analytics_output = analytics_future.result()
+        
+        # Phase 2: content builds on the research, the schedule on content and analytics
         content_task = Task(
-            description=f"""Based on the trending topics research, create a comprehensive content 
-            strategy with specific post ideas, captions, and content formats optimized for 
-            different social media platforms. Ensure all content aligns with {company_name}'s 
-            brand voice while leveraging current trends.""",
-            expected_output="""A detailed content strategy including:
-            1) 20+ specific post ideas with platform adaptations
-            2) Sample captions for each platform
-            3) Content themes and pillars
-            4) Visual content suggestions
-            5) Hashtag recommendations
-            6) Call-to-action strategies""",
+            description=_CONTENT_TASK.format_map({**fields, "research": research_output}),
+            expected_output=_CONTENT_OUTPUT,
             agent=content_agent,
-            context=[research_task]
+            callback=on_task_output
         )
         
         schedule_task = Task(
-            description=f"""Combine the content strategy and optimal timing recommendations to 
-            create a comprehensive 30-day social media publishing schedule for {company_name}. 
-            Include specific posting times, platform assignments, and content details.""",
-            expected_output="""A complete 30-day social media calendar including:
-            1) Daily posting schedule with specific times
-            2) Content assignments with captions
-            3) Visual content requirements
-            4) Cross-platform adaptation notes
-            5) Engagement monitoring checkpoints
-            6) Content preparation timeline""",
+            description=_SCHEDULE_TASK.format_map({**fields, "analytics": analytics_output}),
+            expected_output=_SCHEDULE_OUTPUT,
             agent=scheduler_agent,
-            context=[content_task, analytics_task]
+            context=[content_task],
+            callback=on_task_output
         )
         
-        # Create crew
         crew = Crew(
-            agents=[research_agent, content_agent, analytics_agent, scheduler_agent],
-            tasks=[research_task, analytics_task, content_task, schedule_task],
+            agents=[content_agent, scheduler_agent],
+            tasks=[content_task, schedule_task],
             process=Process.sequential,
-            verbose=True
+            verbose=verbose
         )
         
-        logger.info(f"Starting Social Media crew for {company_name} in {industry}")
-        
-        result = self._execute_crew(crew)
+        output = self._execute_crew(crew)
         
-        return {
+        result = {
             "workflow": "social_media",
-            "output": result,
+            "output": output,
             "input_summary": {
                 "industry": industry,
                 "company_name": company_name
             }
         }
+        
+        if use_cache:
+            get_response_cache().put(cache_key, result)
+        
+        return result
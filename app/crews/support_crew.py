@@ -1,57 +1,60 @@
 """
 Support Crew - CrewAI implementation for customer support workflows.
 """
-from typing import Any
+import asyncio
+import threading
+from functools import lru_cache
 
 from crewai import Agent, Task, Crew, LLM
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
 from app.core.config import get_settings, Settings
+from app.core.llm_factory import get_crewai_llm
+from app.crews._batch import run_batch_items
+from app.crews._retry import crew_retry
+from app.utils.response_cache import get_response_cache, payload_cache_key, cache_enabled
 
 
-def _get_crewai_llm(meta: dict[str, Any] | None, settings: Settings) -> tuple[LLM, str, str]:
+# Task prompt template; CrewAI fills the placeholders from kickoff inputs
+_SUPPORT_TASK = (
+    "Draft a helpful response to this customer issue: '{issue}'. "
+    "Context: {customer_context}. Be empathetic and solution-oriented."
+)
+
+
+@lru_cache(maxsize=64)
+def _get_support_crew(llm: LLM, thread_id: int) -> Crew:
     """
-    Create a CrewAI-compatible LLM from meta and settings.
+    Build and cache a support crew whose task is templated on issue and customer_context.
     
+    Kickoff interpolates inputs into the task in place, so each worker
+    thread gets its own crew rather than sharing one across concurrent runs.
+    
+    Args:
+        llm: CrewAI LLM for the support agent
+        thread_id: Identifier of the calling thread
+        
     Returns:
-        tuple: (LLM instance, provider name, model name)
+        Crew: Crew to kick off with inputs
     """
-    meta = meta or {}
-    
-    # Determine provider
-    provider = meta.get("llm_provider", settings.default_llm_provider)
-    
-    if provider == "anthropic":
-        model = meta.get("model", settings.anthropic_model)
-        llm = LLM(
-            model=model,
-            temperature=0.7,
-            timeout=settings.request_timeout_seconds
-        )
-        return llm, "anthropic", model
-    
-    elif provider == "google":
-        model = meta.get("model", settings.gemini_model)
-        # CrewAI uses "gemini/" prefix for Google models
-        llm = LLM(
-            model=f"gemini/{model}" if not model.startswith("gemini/") else model,
-            temperature=0.7,
-            timeout=settings.request_timeout_seconds
-        )
-        return llm, "google", model
+    support_agent = Agent(
+        role="Customer Support Specialist",
+        goal="Provide helpful and empathetic customer support",
+        backstory="You are a skilled customer support specialist known for resolving issues quickly while maintaining excellent customer relationships.",
+        llm=llm,
+        verbose=False
+    )
     
-    elif provider == "deepseek":
-        model = meta.get("model", settings.deepseek_model)
-        # CrewAI/LiteLLM uses "deepseek/" prefix for DeepSeek models
-        llm = LLM(
-            model=f"deepseek/{model}" if not model.startswith("deepseek/") else model,
-            temperature=0.7,
-            timeout=settings.request_timeout_seconds
-        )
-        return llm, "deepseek", model
+    task = Task(
+        description=_SUPPORT_TASK,
+        expected_output="A helpful customer support response (2-4 sentences)",
+        agent=support_agent
+    )
     
-    else:
-        raise ValueError(f"Unknown LLM provider: {provider}")
+    return Crew(
+        agents=[support_agent],
+        tasks=[task],
+        verbose=False
+    )
 
 
 class SupportCrew:
@@ -60,18 +63,17 @@ class SupportCrew:
     Uses CrewAI with one agent and one task.
     """
     
-    def __init__(self):
-        self.settings = get_settings()
+    def __init__(self, settings: Settings | None = None):
+        self.settings = settings or get_settings()
     
-    @retry(
-        stop=stop_after_attempt(2),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type((TimeoutError, ConnectionError))
-    )
-    def _execute_crew(self, crew: Crew) -> str:
+    @crew_retry
+    def _execute_crew(self, crew: Crew, inputs: dict | None = None) -> str:
         """Execute the crew with retry logic."""
-        result = crew.kickoff()
-        return result.raw if hasattr(result, 'raw') else str(result)
+        result = crew.kickoff(inputs=inputs)
+        try:
+            return result.raw
+        except AttributeError:
+            return str(result)
     
     def run(self, payload: dict, meta: dict | None, trace_id: str) -> dict:
         """
@@ -93,34 +95,25 @@ class SupportCrew:
         customer_context = payload.get("customer_context", "general customer")
         
         # Get LLM
-        llm, provider, model = _get_crewai_llm(meta, self.settings)
+        llm, provider, model = get_crewai_llm(meta, self.settings)
         
-        # Create agent
-        support_agent = Agent(
-            role="Customer Support Specialist",
-            goal=f"Provide helpful and empathetic support for: {issue}",
-            backstory="You are a skilled customer support specialist known for resolving issues quickly while maintaining excellent customer relationships.",
-            llm=llm,
-            verbose=False
-        )
+        # Serve repeated requests from the response cache
+        use_cache = cache_enabled(meta)
+        if use_cache:
+            cache_key = payload_cache_key("support", payload, meta, provider, model)
+            cached = get_response_cache().get(cache_key)
+            if cached is not None:
+                return {**cached, "trace_id": trace_id}
         
-        # Create task
-        task = Task(
-            description=f"Draft a helpful response to this customer issue: '{issue}'. Context: {customer_context}. Be empathetic and solution-oriented.",
-            expected_output="A helpful customer support response (2-4 sentences)",
-            agent=support_agent
-        )
+        # Reuse this thread's crew for the LLM; only the inputs change per run
+        crew = _get_support_crew(llm, threading.get_ident())
         
-        # Create and run crew
-        crew = Crew(
-            agents=[support_agent],
-            tasks=[task],
-            verbose=False
+        output = self._execute_crew(
+            crew,
+            {"issue": issue, "customer_context": customer_context}
         )
         
-        output = self._execute_crew(crew)
-        
-        return {
+        result = {
             "workflow": "support",
             "trace_id": trace_id,
             "provider": provider,
@@ -131,6 +124,34 @@ class SupportCrew:
                 "customer_context": customer_context
             }
         }
+        
+        if use_cache:
+            get_response_cache().put(cache_key, result)
+        
+        return result
+    
+    async def run_batch(self, payloads: list[dict], meta: dict | None, trace_id: str) -> list[dict]:
+        """
+        Run the support crew for several issues concurrently.
+        
+        Each input goes through run() in a worker thread, so validation,
+        retries and the response cache apply per input. At most
+        settings.max_parallel_jobs runs are in flight, and a failed input
+        gets an error entry instead of failing the batch.
+        
+        Args:
+            payloads: Input data for each run, as accepted by run()
+            meta: Optional metadata with llm_provider and model overrides
+            trace_id: Unique trace ID for the request
+            
+        Returns:
+            list[dict]: Results in the same order as payloads
+        """
+        return await run_batch_items(
+            payloads,
+            lambda payload: asyncio.to_thread(self.run, payload, meta, trace_id),
+            self.settings.max_parallel_jobs
+        )
     
     def kickoff(self) -> str:
         """Legacy method for compatibility."""
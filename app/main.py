@@ -1,42 +1,108 @@
 """
 FastAPI application entry point.
 """
-import uuid
-import threading
-from contextlib import asynccontextmanager
-from fastapi import FastAPI, Header, HTTPException, status, Query, BackgroundTasks
-from fastapi.responses import ORJSONResponse
-
-from app.core.config import get_settings
-from app.core.schemas import RunRequest, RunResponse
+import asyncio
+import importlib
+import secrets
+from collections.abc import AsyncIterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, suppress
+from functools import lru_cache
+import orjson
+from fastapi import FastAPI, Depends, Header, HTTPException, status, Query, BackgroundTasks
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel
+
+from app.core.config import get_settings, Settings
+from app.core.schemas import RunRequest, RunResponse, BatchRunRequest, BatchRunResponse
 from app.core.security import require_api_key
-from app.core.job_store import job_store, JobStatus
+from app.core.job_store import get_job_store, JobStatus
+from app.core.llm_factory import install_litellm_http_pool, uninstall_litellm_http_pool
 from app.utils.logging import setup_logging, set_trace_id
 
-from app.crews.marketing_crew import MarketingCrew
-from app.crews.support_crew import SupportCrew
-from app.crews.analysis_crew import AnalysisCrew
-from app.crews.social_media_crew import SocialMediaCrew
-
 # Initialize logging
 logger = setup_logging()
 
-# Map crew names to their classes
+# Map crew names to "module:Class" paths; crew modules pull in crewai and
+# litellm, so each is imported the first time its crew is requested
 CREW_MAP = {
-    "marketing": MarketingCrew,
-    "support": SupportCrew,
-    "analysis": AnalysisCrew,
-    "social_media": SocialMediaCrew,
+    "marketing": "app.crews.marketing_crew:MarketingCrew",
+    "support": "app.crews.support_crew:SupportCrew",
+    "analysis": "app.crews.analysis_crew:AnalysisCrew",
+    "social_media": "app.crews.social_media_crew:SocialMediaCrew",
 }
 
 
-def _run_crew_job(job_id: str, crew_name: str, payload: dict, meta: dict | None, trace_id: str):
+def _build_crew(crew_name: str, settings: Settings):
+    """Import a crew's module and build the crew."""
+    module_path, class_name = CREW_MAP[crew_name].split(":")
+    crew_class = getattr(importlib.import_module(module_path), class_name)
+    return crew_class(settings)
+
+
+@lru_cache(maxsize=len(CREW_MAP))
+def _get_shared_crew(crew_name: str):
+    """Build and cache a crew from the default settings."""
+    return _build_crew(crew_name, get_settings())
+
+
+def _get_crew(crew_name: str, settings: Settings):
+    """
+    Get a crew for the given settings, importing its module on first use.
+    
+    Crews hold no per-request state, so those built from the default
+    settings are shared. Overridden settings (e.g. a dependency override in
+    tests) get a fresh crew, so the override reaches the crew and its LLMs
+    without piling up cached instances.
+    
+    Args:
+        crew_name: A key of CREW_MAP
+        settings: Application settings for the crew
+        
+    Returns:
+        The crew instance
+    """
+    if settings is get_settings():
+        return _get_shared_crew(crew_name)
+    return _build_crew(crew_name, settings)
+
+
+async def _load_crew(crew_name: str, settings: Settings):
+    """
+    Resolve a crew without blocking the event loop.
+    
+    The first request for a crew imports crewai and litellm, which takes
+    seconds, so the import and construction run in a worker thread.
+    
+    Args:
+        crew_name: A key of CREW_MAP
+        settings: Application settings for the crew
+        
+    Returns:
+        The crew instance, or None if it could not be loaded
+    """
+    try:
+        return await asyncio.to_thread(_get_crew, crew_name, settings)
+    except Exception as e:
+        logger.error(f"Crew {crew_name} failed to load: {type(e).__name__}")
+        return None
+
+
+def _run_crew_job(
+    job_id: str,
+    crew,
+    crew_name: str,
+    payload: dict,
+    meta: dict | None,
+    trace_id: str
+):
     """
     Background task to run a crew job.
     
     Args:
         job_id: The job ID
-        crew_name: Name of the crew to run
+        crew: Crew instance to run
+        crew_name: Name of the crew, for logging
         payload: Input data
         meta: Optional metadata
         trace_id: Trace ID for the request
@@ -44,32 +110,29 @@ def _run_crew_job(job_id: str, crew_name: str, payload: dict, meta: dict | None,
     set_trace_id(trace_id)
     
     # Update job to running
-    job_store.update_job(job_id, status=JobStatus.RUNNING)
+    get_job_store().update_job(job_id, status=JobStatus.RUNNING)
     logger.info(f"Job {job_id} started for crew: {crew_name}")
     
     try:
-        crew_class = CREW_MAP[crew_name]
-        crew = crew_class()
         result = crew.run(payload, meta, trace_id)
         
-        job_store.update_job(job_id, status=JobStatus.DONE, result=result)
+        get_job_store().update_job(job_id, status=JobStatus.DONE, result=result)
         logger.info(f"Job {job_id} completed successfully")
         
     except Exception as e:
         logger.error(f"Job {job_id} failed: {type(e).__name__}")
-        job_store.update_job(
+        get_job_store().update_job(
             job_id,
             status=JobStatus.FAILED,
             error={"code": "EXECUTION_ERROR", "message": "An error occurred during crew execution"}
         )
 
 
-def _cleanup_jobs_periodically():
-    """Background thread to cleanup old jobs periodically."""
-    import time
+async def _cleanup_jobs_periodically():
+    """Background task to cleanup old jobs periodically."""
     while True:
-        time.sleep(300)  # Every 5 minutes
-        removed = job_store.cleanup_old_jobs()
+        await asyncio.sleep(300)  # Every 5 minutes
+        removed = await asyncio.to_thread(get_job_store().cleanup_old_jobs)
         if removed > 0:
             logger.info(f"Cleaned up {removed} old jobs")
 
@@ -77,14 +140,33 @@ def _cleanup_jobs_periodically():
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup/shutdown."""
-    # Start cleanup thread
-    cleanup_thread = threading.Thread(target=_cleanup_jobs_periodically, daemon=True)
-    cleanup_thread.start()
-    logger.info("Job cleanup thread started")
+    # Start cleanup task
+    cleanup_task = asyncio.create_task(_cleanup_jobs_periodically())
+    logger.info("Job cleanup task started")
+    
+    settings = get_settings()
+    
+    # Bounded worker pool for async jobs
+    app.state.job_pool = ThreadPoolExecutor(
+        max_workers=settings.max_parallel_jobs,
+        thread_name_prefix="crew-job"
+    )
+    logger.info(f"Job pool started with {settings.max_parallel_jobs} workers")
+    
+    # Share pooled HTTP connections across all LLM calls
+    http_client, async_http_client = install_litellm_http_pool(settings)
+    logger.info("LLM HTTP connection pool created")
     
     yield
     
     logger.info("Shutting down")
+    cleanup_task.cancel()
+    with suppress(asyncio.CancelledError):
+        await cleanup_task
+    app.state.job_pool.shutdown(wait=False, cancel_futures=True)
+    uninstall_litellm_http_pool()
+    http_client.close()
+    await async_http_client.aclose()
 
 
 # Initialize FastAPI app
@@ -97,125 +179,322 @@ app = FastAPI(
 )
 
 
+def _json_response(model: BaseModel) -> ORJSONResponse:
+    """
+    Serialize a response model directly with orjson.
+    
+    Returning the response ourselves skips FastAPI's jsonable_encoder pass
+    over potentially large crew output.
+    """
+    return ORJSONResponse(model.model_dump())
+
+
+def _crew_unavailable(response_class: type[BaseModel], crew_name: str, trace_id: str) -> ORJSONResponse:
+    """Build the error response for a crew whose module failed to load."""
+    return _json_response(response_class.model_construct(
+        ok=False,
+        crew=crew_name,
+        trace_id=trace_id,
+        error={"code": "CREW_UNAVAILABLE", "message": f"Crew '{crew_name}' could not be loaded"}
+    ))
+
+
+def _sse_event(event: str, data: dict) -> bytes:
+    """Encode one server-sent event."""
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+
+async def _stream_crew_run(crew, crew_name: str, request: RunRequest, trace_id: str) -> AsyncIterator[bytes]:
+    """
+    Run a crew in a worker thread and stream its progress as server-sent events.
+    
+    Emits a "task" event as each crew task finishes, then a final "result"
+    event carrying the same body as a non-streaming run. A task re-run by
+    the retry policy is not sent again, so the "result" event is the
+    authoritative output.
+    
+    Args:
+        crew: Crew instance to run
+        crew_name: Name of the crew
+        request: Input data and optional metadata
+        trace_id: Trace ID for the request
+        
+    Yields:
+        bytes: Encoded SSE events
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue[dict | None] = asyncio.Queue()
+    sent: set[str] = set()
+    
+    def emit(output) -> None:
+        # Runs on the event loop, so the set needs no lock
+        if output.description in sent:
+            return
+        sent.add(output.description)
+        queue.put_nowait({"agent": output.agent, "output": output.raw})
+    
+    def on_task_output(output) -> None:
+        # Called from the crew's worker thread(s)
+        loop.call_soon_threadsafe(emit, output)
+    
+    run_task = asyncio.ensure_future(
+        asyncio.to_thread(crew.run, request.input, request.meta, trace_id, on_task_output)
+    )
+    run_task.add_done_callback(lambda _: queue.put_nowait(None))
+    
+    while (item := await queue.get()) is not None:
+        yield _sse_event("task", item)
+    
+    try:
+        result = run_task.result()
+    except Exception as e:
+        logger.error(f"Crew {crew_name} failed: {type(e).__name__}")
+        yield _sse_event("result", {
+            "ok": False,
+            "crew": crew_name,
+            "trace_id": trace_id,
+            "result": None,
+            "error": {
+                "code": "EXECUTION_ERROR",
+                "message": "An error occurred during crew execution"
+            }
+        })
+        return
+    
+    logger.info(f"Crew {crew_name} completed successfully")
+    yield _sse_event("result", {
+        "ok": True,
+        "crew": crew_name,
+        "trace_id": trace_id,
+        "result": result,
+        "error": None
+    })
+
+
 @app.get("/health")
 async def health_check() -> dict:
     """Health check endpoint."""
     return {"ok": True}
 
 
-@app.post("/crews/{crew_name}/run")
+@app.post("/crews/{crew_name}/run", response_model=None)
 async def run_crew(
     crew_name: str,
     request: RunRequest,
     background_tasks: BackgroundTasks,
     x_api_key: str | None = Header(default=None, alias="X-API-Key"),
-    async_mode: bool = Query(default=False, alias="async")
-) -> dict:
+    async_mode: bool = Query(default=False, alias="async"),
+    stream: bool = Query(default=False),
+    settings: Settings = Depends(get_settings)
+) -> ORJSONResponse | StreamingResponse:
     """
     Run a specific crew with the provided input.
     
+    Responses are built from server-side data only, so RunResponse is created
+    with model_construct and serialized straight to JSON without re-validation.
+    
     Args:
         crew_name: Name of the crew to run (marketing, support, analysis)
         request: Input data and optional metadata
         x_api_key: API key for authentication
         async_mode: If true, run asynchronously and return job_id
+        stream: If true, stream task outputs as server-sent events
+        settings: Application settings
         
     Returns:
-        RunResponse or async job reference
+        RunResponse, async job reference, or event stream
     """
     # Generate trace ID for this request
-    trace_id = str(uuid.uuid4())
+    trace_id = secrets.token_hex(8)
     set_trace_id(trace_id)
     
-    logger.info(f"Received request for crew: {crew_name} (async={async_mode})")
+    logger.info(f"Received request for crew: {crew_name} (async={async_mode}, stream={stream})")
     
     # Validate API key
-    settings = get_settings()
     require_api_key(x_api_key, settings)
     
     # Check if crew exists
     if crew_name not in CREW_MAP:
         logger.warning(f"Crew not found: {crew_name}")
-        return {
-            "ok": False,
-            "crew": crew_name,
-            "trace_id": trace_id,
-            "error": {"code": "CREW_NOT_FOUND", "message": f"Crew '{crew_name}' not found"}
-        }
+        return _json_response(RunResponse.model_construct(
+            ok=False,
+            crew=crew_name,
+            trace_id=trace_id,
+            error={"code": "CREW_NOT_FOUND", "message": f"Crew '{crew_name}' not found"}
+        ))
+    
+    crew = await _load_crew(crew_name, settings)
+    if crew is None:
+        return _crew_unavailable(RunResponse, crew_name, trace_id)
     
     # Async mode: create job and return immediately
     if async_mode:
-        job = job_store.create_job(trace_id=trace_id, crew=crew_name)
+        # The Redis job store is synchronous, so keep its I/O off the event loop
+        job = await asyncio.to_thread(get_job_store().create_job, trace_id=trace_id, crew=crew_name)
         
-        # Run in background thread (not asyncio task for CPU-bound work)
-        thread = threading.Thread(
-            target=_run_crew_job,
-            args=(job.job_id, crew_name, request.input, request.meta, trace_id)
+        # Run on the bounded job pool (not asyncio task for blocking work)
+        app.state.job_pool.submit(
+            _run_crew_job, job.job_id, crew, crew_name, request.input, request.meta, trace_id
         )
-        thread.start()
         
         logger.info(f"Created async job: {job.job_id}")
         
-        return {
+        return ORJSONResponse({
             "ok": True,
             "trace_id": trace_id,
             "crew": crew_name,
             "job_id": job.job_id
-        }
+        })
+    
+    # Stream mode: send each task's output as it completes
+    if stream:
+        # Single-task crews would send their only task event with the result
+        if not getattr(crew, "streams_task_output", False):
+            return _json_response(RunResponse.model_construct(
+                ok=False,
+                crew=crew_name,
+                trace_id=trace_id,
+                error={"code": "STREAM_NOT_SUPPORTED", "message": f"Crew '{crew_name}' does not support streaming"}
+            ))
+        
+        return StreamingResponse(
+            _stream_crew_run(crew, crew_name, request, trace_id),
+            media_type="text/event-stream"
+        )
     
     # Sync mode: run immediately and return result
     try:
-        crew_class = CREW_MAP[crew_name]
-        crew = crew_class()
-        
         logger.info(f"Running crew: {crew_name}")
-        result = crew.run(request.input, request.meta, trace_id)
+        # Crew runs block on LLM I/O, so keep them off the event loop
+        result = await asyncio.to_thread(crew.run, request.input, request.meta, trace_id)
         
         logger.info(f"Crew {crew_name} completed successfully")
         
-        return {
-            "ok": True,
-            "crew": crew_name,
-            "trace_id": trace_id,
-            "result": result,
-            "error": None
-        }
+        return _json_response(RunResponse.model_construct(
+            ok=True,
+            crew=crew_name,
+            trace_id=trace_id,
+            result=result,
+            error=None
+        ))
         
     except Exception as e:
         logger.error(f"Crew {crew_name} failed: {type(e).__name__}")
         
-        return {
-            "ok": False,
-            "crew": crew_name,
-            "trace_id": trace_id,
-            "result": None,
-            "error": {
+        return _json_response(RunResponse.model_construct(
+            ok=False,
+            crew=crew_name,
+            trace_id=trace_id,
+            result=None,
+            error={
                 "code": "EXECUTION_ERROR",
                 "message": "An error occurred during crew execution"
             }
-        }
+        ))
+
+
+@app.post("/crews/{crew_name}/batch", response_model=None)
+async def run_crew_batch(
+    crew_name: str,
+    request: BatchRunRequest,
+    x_api_key: str | None = Header(default=None, alias="X-API-Key"),
+    settings: Settings = Depends(get_settings)
+) -> ORJSONResponse:
+    """
+    Run a crew over several inputs concurrently.
+    
+    Args:
+        crew_name: Name of the crew to run (must support batch execution)
+        request: List of inputs and optional shared metadata
+        x_api_key: API key for authentication
+        settings: Application settings
+        
+    Returns:
+        BatchRunResponse with one result per input, in input order
+    """
+    # Generate trace ID for this request
+    trace_id = secrets.token_hex(8)
+    set_trace_id(trace_id)
+    
+    logger.info(f"Received batch request for crew: {crew_name} ({len(request.inputs)} inputs)")
+    
+    # Validate API key
+    require_api_key(x_api_key, settings)
+    
+    # Check if crew exists
+    if crew_name not in CREW_MAP:
+        logger.warning(f"Crew not found: {crew_name}")
+        return _json_response(BatchRunResponse.model_construct(
+            ok=False,
+            crew=crew_name,
+            trace_id=trace_id,
+            error={"code": "CREW_NOT_FOUND", "message": f"Crew '{crew_name}' not found"}
+        ))
+    
+    crew = await _load_crew(crew_name, settings)
+    if crew is None:
+        return _crew_unavailable(BatchRunResponse, crew_name, trace_id)
+    
+    # Check if crew supports batching
+    if not hasattr(crew, "run_batch"):
+        logger.warning(f"Crew does not support batch runs: {crew_name}")
+        return _json_response(BatchRunResponse.model_construct(
+            ok=False,
+            crew=crew_name,
+            trace_id=trace_id,
+            error={"code": "BATCH_NOT_SUPPORTED", "message": f"Crew '{crew_name}' does not support batch runs"}
+        ))
+    
+    try:
+        results = await crew.run_batch(request.inputs, request.meta, trace_id)
+        
+        logger.info(f"Batch for crew {crew_name} completed successfully")
+        
+        return _json_response(BatchRunResponse.model_construct(
+            ok=True,
+            crew=crew_name,
+            trace_id=trace_id,
+            results=results,
+            error=None
+        ))
+        
+    except Exception as e:
+        logger.error(f"Batch for crew {crew_name} failed: {type(e).__name__}")
+        
+        return _json_response(BatchRunResponse.model_construct(
+            ok=False,
+            crew=crew_name,
+            trace_id=trace_id,
+            results=None,
+            error={
+                "code": "EXECUTION_ERROR",
+                "message": "An error occurred during crew execution"
+            }
+        ))
 
 
 @app.get("/jobs/{job_id}")
 async def get_job(
     job_id: str,
-    x_api_key: str | None = Header(default=None, alias="X-API-Key")
-) -> dict:
+    x_api_key: str | None = Header(default=None, alias="X-API-Key"),
+    settings: Settings = Depends(get_settings)
+) -> ORJSONResponse:
     """
     Get the status of an async job.
     
     Args:
         job_id: The job ID
         x_api_key: API key for authentication
+        settings: Application settings
         
     Returns:
         Job status and result if completed
     """
     # Validate API key
-    settings = get_settings()
     require_api_key(x_api_key, settings)
     
-    job = job_store.get_job(job_id)
+    # The Redis job store is synchronous, so keep its I/O off the event loop
+    job = await asyncio.to_thread(get_job_store().get_job_snapshot, job_id)
     
     if job is None:
         raise HTTPException(
@@ -223,12 +502,4 @@ async def get_job(
             detail=f"Job '{job_id}' not found"
         )
     
-    return {
-        "ok": True,
-        "job_id": job.job_id,
-        "status": job.status.value,
-        "crew": job.crew,
-        "trace_id": job.trace_id,
-        "result": job.result,
-        "error": job.error
-    }
+    return ORJSONResponse({"ok": True, **job})
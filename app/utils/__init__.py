@@ -1,3 +1,17 @@
 from .logging import setup_logging, set_trace_id, get_trace_id
+from .response_cache import (
+    get_response_cache,
+    payload_cache_key,
+    cache_enabled,
+    ResponseCache,
+)
 
-__all__ = ["setup_logging", "set_trace_id", "get_trace_id"]
+__all__ = [
+    "setup_logging",
+    "set_trace_id",
+    "get_trace_id",
+    "get_response_cache",
+    "payload_cache_key",
+    "cache_enabled",
+    "ResponseCache",
+]
@@ -9,37 +9,50 @@ from contextvars import ContextVar
 trace_id_var: ContextVar[str] = ContextVar("trace_id", default="-")
 
 
-class TraceIdFilter(logging.Filter):
-    """Logging filter that adds trace_id to log records."""
+def _install_trace_id_factory() -> None:
+    """Stamp trace_id on every log record when it is created."""
+    base_factory = logging.getLogRecordFactory()
     
-    def filter(self, record: logging.LogRecord) -> bool:
+    def factory(*args, **kwargs) -> logging.LogRecord:
+        record = base_factory(*args, **kwargs)
         record.trace_id = trace_id_var.get()
-        return True
+        return record
+    
+    logging.setLogRecordFactory(factory)
+
+
+# Shared formatter, created once per process
+_FORMATTER = logging.Formatter(
+    fmt="%(asctime)s | %(levelname)-8s | trace_id=%(trace_id)s | %(name)s | %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S"
+)
 
 
 def setup_logging(level: int = logging.INFO) -> logging.Logger:
     """
     Configure logging with trace ID included in the format.
     
+    Safe to call more than once (e.g. on reload); the handler and the
+    trace_id record factory are only installed the first time. The factory
+    covers records from every logger, including crewai and litellm.
+    
     Args:
         level: Logging level (default: INFO)
         
     Returns:
         Logger: Configured logger instance
     """
-    # Create formatter with trace_id
-    formatter = logging.Formatter(
-        fmt="%(asctime)s | %(levelname)-8s | trace_id=%(trace_id)s | %(name)s | %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S"
-    )
+    logger = logging.getLogger("my_ai_agency")
+    if logger.handlers:
+        return logger
+    
+    _install_trace_id_factory()
     
     # Create console handler
     handler = logging.StreamHandler(sys.stdout)
-    handler.setFormatter(formatter)
-    handler.addFilter(TraceIdFilter())
+    handler.setFormatter(_FORMATTER)
     
     # Configure root logger
-    logger = logging.getLogger("my_ai_agency")
     logger.setLevel(level)
     logger.addHandler(handler)
     logger.propagate = False
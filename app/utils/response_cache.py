@@ -0,0 +1,183 @@
+"""
+Two-tier cache for crew outputs.
+
+L1 is a bounded in-process LRU with a TTL; L2 is an optional Redis instance
+shared by all workers. Lookups go L1 -> L2 -> crew run.
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any
+
+import orjson
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+def payload_cache_key(crew: str, payload: dict[str, Any], meta: dict[str, Any] | None, *models: str) -> bytes:
+    """
+    Build a cache key from a crew's normalized request input.
+
+    Args:
+        crew: Crew name
+        payload: Request input data
+        meta: Optional request metadata
+        models: Resolved provider/model names the output depends on, so a
+            settings change does not serve results from the old model
+
+    Returns:
+        bytes: Binary digest identifying the request
+    """
+    key_data = {"crew": crew, "payload": payload, "meta": meta, "models": models}
+    
+    # Sorted keys make the encoding canonical; orjson emits bytes directly
+    try:
+        data = orjson.dumps(key_data, option=orjson.OPT_SORT_KEYS)
+    except orjson.JSONEncodeError:
+        # orjson rejects some valid JSON, e.g. integers beyond 64 bits
+        data = json.dumps(key_data, sort_keys=True).encode()
+    return hashlib.sha256(data).digest()
+
+
+def cache_enabled(meta: dict[str, Any] | None) -> bool:
+    """Check whether the request allows cached responses (meta.no_cache opts out)."""
+    return not (meta or {}).get("no_cache")
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache with per-entry TTL and an optional Redis tier.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl_seconds: int = 3600,
+        redis_url: str | None = None,
+        redis_timeout: float = 5.0
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of in-process entries (default: 1024)
+            ttl_seconds: Time-to-live for entries in seconds (default: 1 hour)
+            redis_url: Redis connection URL for the shared tier (optional)
+            redis_timeout: Socket and connect timeout for Redis in seconds (default: 5)
+        """
+        self._entries: OrderedDict[bytes, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._maxsize = maxsize
+        self._ttl_seconds = ttl_seconds
+        self._redis = None
+
+        if redis_url:
+            import redis
+
+            # Bounded timeouts so a hung Redis degrades to a cache miss
+            self._redis = redis.Redis.from_url(
+                redis_url,
+                socket_timeout=redis_timeout,
+                socket_connect_timeout=redis_timeout
+            )
+
+    @staticmethod
+    def _redis_key(key: bytes) -> bytes:
+        """Get the Redis key for a cache key."""
+        return b"response:" + key
+
+    def _get_local(self, key: bytes) -> Any | None:
+        """Get a value from the in-process tier."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def _put_local(self, key: bytes, value: Any) -> None:
+        """Store a value in the in-process tier."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self._ttl_seconds, value)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def get(self, key: bytes) -> Any | None:
+        """
+        Get a cached value, checking the in-process tier before Redis.
+
+        Args:
+            key: The cache key
+
+        Returns:
+            The cached value or None if not present
+        """
+        value = self._get_local(key)
+        if value is not None or self._redis is None:
+            return value
+
+        try:
+            data = self._redis.get(self._redis_key(key))
+        except Exception as e:
+            logger.warning(f"Response cache read failed: {type(e).__name__}")
+            return None
+
+        if data is None:
+            return None
+
+        value = orjson.loads(data)
+        self._put_local(key, value)
+        return value
+
+    def put(self, key: bytes, value: Any) -> None:
+        """
+        Store a value in both tiers, evicting the least recently used local entry when full.
+
+        Args:
+            key: The cache key
+            value: JSON-serializable value to cache
+        """
+        self._put_local(key, value)
+
+        if self._redis is None:
+            return
+
+        try:
+            self._redis.set(self._redis_key(key), orjson.dumps(value), ex=self._ttl_seconds)
+        except Exception as e:
+            logger.warning(f"Response cache write failed: {type(e).__name__}")
+
+    def clear(self) -> None:
+        """Remove all in-process entries."""
+        with self._lock:
+            self._entries.clear()
+
+
+@lru_cache
+def get_response_cache() -> ResponseCache:
+    """
+    Get the response cache configured from settings.
+
+    Returns:
+        ResponseCache: Shared cache instance
+    """
+    settings = get_settings()
+    return ResponseCache(
+        maxsize=1024,
+        ttl_seconds=settings.response_cache_ttl_seconds,
+        redis_url=settings.cache_redis_url,
+        redis_timeout=settings.redis_timeout_seconds
+    )